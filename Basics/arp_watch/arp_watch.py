@@ -2,18 +2,26 @@
 # Detects suspicious ARP changes that could indicate ARP spoofing / MITM.
 # Usage:
 #   python arp_watch.py --gateway 192.168.1.1 --interval 5 --log arp_watch.log
+#   python arp_watch.py --gateway 192.168.1.1 10.0.0.1 --interval 5   (several gateways at once)
 #
 # Notes:
 # - Works without scapy; if scapy is installed, uses it for more reliable ARP queries.
 # - Monitors ONLY and never injects packets.
 # - Run with regular user privileges (reading ARP table is enough).
 # - Cross-platform best effort: uses OS commands to read ARP cache if scapy isn't available.
+# - On Linux, if pyroute2 is installed, the neighbour and route tables are read over netlink
+#   instead of forking 'ip'/'arp' on every poll; otherwise /proc/net/arp is read directly.
 
 import argparse
+import asyncio
+import atexit
 import platform
+import queue
+import shutil
+import socket
 import subprocess
 import sys
-import time
+import threading
 from datetime import datetime
 
 try:
@@ -22,12 +30,168 @@ try:
 except Exception:
     SCAPY_AVAILABLE = False
 
+try:
+    from pyroute2 import IPRoute  # optional, Linux only
+    PYROUTE2_AVAILABLE = True
+except Exception:
+    PYROUTE2_AVAILABLE = False
+
+# Look up the ARP tools once instead of hitting FileNotFoundError on every poll
+_HAS_IP = shutil.which("ip") is not None
+_HAS_ARP = shutil.which("arp") is not None
+
+# Neighbour states that carry a usable MAC; INCOMPLETE (0x01) and FAILED (0x20) don't.
+# An idle gateway entry normally sits in STALE, so that has to count too.
+NUD_REACHABLE = 0x02
+NUD_STALE = 0x04
+NUD_DELAY = 0x08
+NUD_PROBE = 0x10
+NUD_PERMANENT = 0x80
+NUD_VALID = NUD_REACHABLE | NUD_STALE | NUD_DELAY | NUD_PROBE | NUD_PERMANENT
+_ipr = None
+# Lookups run in worker threads when several gateways are watched; the shared
+# netlink socket must not be used by two threads at once
+_ipr_lock = threading.Lock()
+
+def _get_ipr():
+    # One netlink socket for the lifetime of the process
+    global _ipr
+    if _ipr is None:
+        _ipr = IPRoute()
+    return _ipr
+
+def get_mac_netlink(ip):
+    if not PYROUTE2_AVAILABLE:
+        return None
+    try:
+        with _ipr_lock:
+            neighbours = _get_ipr().get_neighbours(dst=ip, family=socket.AF_INET)
+        for r in neighbours:
+            # Skip incomplete/failed entries, which have no MAC to trust
+            if not r.get("state", 0) & NUD_VALID:
+                continue
+            mac = dict(r["attrs"]).get("NDA_LLADDR")
+            if mac:
+                return normalize_mac(mac)
+    except Exception:
+        return None
+    return None
+
+PROC_NET_ARP = "/proc/net/arp"
+ATF_COM = 0x02  # entry is complete (has a MAC)
+
+def get_mac_proc_arp(ip):
+    # Linux exposes the ARP table as a file; reading it needs no fork/exec.
+    # Raises OSError if the file isn't available so callers can fall back.
+    with open(PROC_NET_ARP, "rb") as f:
+        data = f.read()
+    target = ip.encode("ascii")
+    # Columns: IP address, HW type, Flags, HW address, Mask, Device (first line is the header)
+    for line in data.splitlines()[1:]:
+        fields = line.split()
+        if len(fields) >= 4 and fields[0] == target:
+            if int(fields[2], 16) & ATF_COM:
+                return normalize_mac(fields[3].decode("ascii"))
+    return None
+
+def get_default_gateway_netlink():
+    if not PYROUTE2_AVAILABLE:
+        return None
+    try:
+        with _ipr_lock:
+            routes = _get_ipr().get_default_routes(family=socket.AF_INET)
+        for r in routes:
+            gw = dict(r["attrs"]).get("RTA_GATEWAY")
+            if gw:
+                return gw
+    except Exception:
+        return None
+    return None
+
+# Log file writes go through a queue to a background thread so the poll loop
+# never blocks on disk; files are opened once and kept open
+_log_q = queue.Queue(maxsize=1024)
+LOG_PUT_TIMEOUT = 2  # seconds log() may wait on a full queue before giving up on the file
+_log_thread = None
+_log_thread_lock = threading.Lock()
+
+def _log_writer():
+    files = {}
+    try:
+        while True:
+            # Block for one line, then drain whatever else queued up and write it as a batch
+            items = [_log_q.get()]
+            while True:
+                try:
+                    items.append(_log_q.get_nowait())
+                except queue.Empty:
+                    break
+            stop = False
+            batches = {}
+            for item in items:
+                if item is None:
+                    stop = True
+                    continue
+                logfile, line = item
+                batches.setdefault(logfile, []).append(line)
+            for logfile, lines in batches.items():
+                try:
+                    f = files.get(logfile)
+                    if f is None:
+                        f = files[logfile] = open(logfile, "a", encoding="utf-8", errors="backslashreplace")
+                    f.write("".join(lines))
+                    f.flush()
+                except Exception as e:
+                    # Any failure (bad path, unencodable text, disk full) must not kill
+                    # the writer, or log() would end up waiting on a queue nobody drains
+                    print(f"Warning: could not write to log file {logfile}: {e}")
+                    f = files.pop(logfile, None)
+                    if f is not None:
+                        try:
+                            f.close()
+                        except Exception:
+                            pass
+            if stop:
+                return
+    finally:
+        for f in files.values():
+            f.close()
+
+def _stop_log_writer():
+    if _log_thread is not None and _log_thread.is_alive():
+        try:
+            _log_q.put(None, timeout=LOG_PUT_TIMEOUT)
+        except queue.Full:
+            return
+        _log_thread.join(timeout=2)
+
+def _ensure_log_writer():
+    global _log_thread
+    with _log_thread_lock:
+        if _log_thread is None:
+            _log_thread = threading.Thread(target=_log_writer, name="arp_watch-log", daemon=True)
+            _log_thread.start()
+            # Flush anything still queued when the program exits (including sys.exit)
+            atexit.register(_stop_log_writer)
+
 def log(msg, logfile=None):
     line = f"[{datetime.now().isoformat(timespec='seconds')}] {msg}"
     print(line)
     if logfile:
-        with open(logfile, "a", encoding="utf-8") as f:
-            f.write(line + "\n")
+        _ensure_log_writer()
+        if not _log_thread.is_alive():
+            print("Warning: log writer is not running; line not written to log file")
+            return
+        item = (logfile, line + "\n")
+        try:
+            _log_q.put_nowait(item)
+        except queue.Full:
+            # Give the writer a chance to catch up rather than dropping alerts, but
+            # never block the detector indefinitely (the line was already printed)
+            try:
+                _log_q.put(item, timeout=LOG_PUT_TIMEOUT)
+            except queue.Full:
+                print("Warning: log writer is stalled; line not written to log file")
 
 def normalize_mac(mac):
     if not mac:
@@ -50,15 +214,28 @@ def get_mac_from_arp_table(ip):
                     if len(tokens) >= 3 and tokens[0] == ip:
                         return normalize_mac(tokens[1])
         elif system in ("linux", "darwin"):
-            # Try 'ip neigh' first (Linux), fallback to 'arp -n'
-            try:
-                out = subprocess.check_output(["ip", "neigh", "show", ip], text=True, errors="ignore")
-                # Example: "192.168.1.1 dev wlan0 lladdr 1c:1b:0d:xx:xx:xx REACHABLE"
-                for tok in out.split():
-                    if tok.count(":") == 5:  # naive MAC check
-                        return normalize_mac(tok)
-            except Exception:
-                pass
+            if system == "linux":
+                mac = get_mac_netlink(ip)
+                if mac:
+                    return mac
+                try:
+                    return get_mac_proc_arp(ip)
+                except (OSError, ValueError):
+                    pass
+            # Try 'ip neigh' first (Linux), fallback to 'arp -n' only if 'ip' is
+            # missing or fails; an entry without a MAC (e.g. FAILED) won't be in 'arp' either
+            if _HAS_IP:
+                try:
+                    out = subprocess.check_output(["ip", "neigh", "show", ip], text=True, errors="ignore")
+                    # Example: "192.168.1.1 dev wlan0 lladdr 1c:1b:0d:xx:xx:xx REACHABLE"
+                    for tok in out.split():
+                        if tok.count(":") == 5:  # naive MAC check
+                            return normalize_mac(tok)
+                    return None
+                except Exception:
+                    pass
+            if not _HAS_ARP:
+                return None
             try:
                 out = subprocess.check_output(["arp", "-n", ip], text=True, errors="ignore")
                 # Example: "? (192.168.1.1) at 1c:1b:0d:xx:xx:xx [ether] on wlan0"
@@ -71,13 +248,23 @@ def get_mac_from_arp_table(ip):
         return None
     return None
 
+_arp_templates = {}
+
+def _arp_request(ip):
+    # Build the who-has packet once per target IP and reuse it on every poll
+    pkt = _arp_templates.get(ip)
+    if pkt is None:
+        pkt = _arp_templates[ip] = Ether(dst="ff:ff:ff:ff:ff:ff")/ARP(pdst=ip)
+    return pkt
+
 def get_mac_scapy(ip, timeout=2):
     if not SCAPY_AVAILABLE:
         return None
     try:
         conf.verb = 0
-        pkt = Ether(dst="ff:ff:ff:ff:ff:ff")/ARP(pdst=ip)
-        ans, _ = srp(pkt, timeout=timeout, retry=1)
+        # srp opens a fresh socket per probe on purpose: a long-lived raw socket
+        # would queue old traffic and could hand back a stale reply
+        ans, _ = srp(_arp_request(ip), timeout=timeout, retry=1)
         for _, r in ans:
             return normalize_mac(r[Ether].src)
     except Exception:
@@ -91,6 +278,32 @@ def get_gateway_mac(ip):
         return mac
     return get_mac_from_arp_table(ip)
 
+async def resolve_gateway_macs(gateways):
+    # Probe all gateways concurrently; each blocking lookup runs in a worker thread
+    return await asyncio.gather(*(asyncio.to_thread(get_gateway_mac, ip) for ip in gateways))
+
+def check_gateway(ip, current, baseline, expected, logfile=None):
+    if not current:
+        log(f"Warning: Could not read current MAC for {ip}. Network hiccup?", logfile)
+        return
+
+    if expected:
+        if current != expected:
+            log(f"ALERT: Gateway {ip} MAC changed to {current}, expected {expected}. Possible MITM!", logfile)
+    else:
+        if current != baseline:
+            log(f"ALERT: Gateway {ip} MAC changed! was {baseline}, now {current}. Possible ARP spoofing.", logfile)
+            # Optional: update baseline only if you know the change is legitimate
+            # baselines[ip] = current
+
+async def watch(baselines, expected, interval, logfile=None):
+    gateways = list(baselines)
+    while True:
+        await asyncio.sleep(interval)
+        results = await resolve_gateway_macs(gateways)
+        for ip, current in zip(gateways, results):
+            check_gateway(ip, current, baselines[ip], expected, logfile)
+
 def detect_default_gateway():
     system = platform.system().lower()
     try:
@@ -100,6 +313,9 @@ def detect_default_gateway():
             out = subprocess.check_output(cmd, text=True, errors="ignore").strip()
             return out or None
         elif system == "linux":
+            gw = get_default_gateway_netlink()
+            if gw:
+                return gw
             out = subprocess.check_output(["/bin/sh", "-c", "ip route | awk '/^default/ {print $3; exit}'"], text=True, errors="ignore").strip()
             return out or None
         elif system == "darwin":
@@ -113,7 +329,7 @@ def detect_default_gateway():
 
 def main():
     parser = argparse.ArgumentParser(description="Monitor gateway MAC to detect ARP spoofing attempts.")
-    parser.add_argument("--gateway", help="Gateway/router IPv4 address, e.g., 192.168.1.1")
+    parser.add_argument("--gateway", nargs="+", help="Gateway/router IPv4 address(es), e.g., 192.168.1.1")
     parser.add_argument("--interval", type=int, default=5, help="Seconds between checks (default: 5)")
     parser.add_argument("--expect", help="(Optional) Expected gateway MAC; alert immediately if different")
     parser.add_argument("--log", dest="logfile", help="(Optional) Path to log file")
@@ -121,57 +337,48 @@ def main():
     parser.add_argument("--auto-detect", action="store_true", help="If provided gateway is unreachable, try system default gateway")
     args = parser.parse_args()
 
-    gateway_ip = args.gateway
-    if not gateway_ip and args.auto_detect:
+    gateways = list(dict.fromkeys(args.gateway or []))
+    if not gateways and args.auto_detect:
         gateway_ip = detect_default_gateway()
         if gateway_ip:
             log(f"Auto-detected gateway: {gateway_ip}", args.logfile)
+            gateways = [gateway_ip]
 
-    if not gateway_ip:
+    if not gateways:
         parser.error("No gateway specified and auto-detect not enabled or failed.")
+    if args.expect and len(gateways) > 1:
+        parser.error("--expect can only be used with a single gateway.")
 
     expected = normalize_mac(args.expect) if args.expect else None
-    baseline = None
 
     # Initial read
-    mac = get_gateway_mac(gateway_ip)
-    if not mac and args.auto_detect:
+    macs = asyncio.run(resolve_gateway_macs(gateways))
+    if len(gateways) == 1 and not macs[0] and args.auto_detect:
         # try detecting system default gateway and retry once
         gw2 = detect_default_gateway()
-        if gw2 and gw2 != gateway_ip:
+        if gw2 and gw2 != gateways[0]:
             log(f"Retrying with detected gateway {gw2}", args.logfile)
-            gateway_ip = gw2
-            mac = get_gateway_mac(gateway_ip)
+            gateways = [gw2]
+            macs = [get_gateway_mac(gw2)]
 
-    if not mac:
-        log(f"Could not resolve MAC for gateway {gateway_ip}. Is the IP correct and reachable?", args.logfile)
+    missing = [ip for ip, mac in zip(gateways, macs) if not mac]
+    for ip in missing:
+        log(f"Could not resolve MAC for gateway {ip}. Is the IP correct and reachable?", args.logfile)
+    if missing:
         sys.exit(1)
 
-    baseline = mac
-    log(f"Initial gateway MAC for {gateway_ip}: {baseline}", args.logfile)
+    baselines = dict(zip(gateways, macs))
+    for ip, baseline in baselines.items():
+        log(f"Initial gateway MAC for {ip}: {baseline}", args.logfile)
 
-    # If user provided expected MAC, verify immediately
-    if expected and baseline != expected:
-        log(f"ALERT: Gateway MAC {baseline} != expected {expected}. Possible ARP spoofing!", args.logfile)
+        # If user provided expected MAC, verify immediately
+        if expected and baseline != expected:
+            log(f"ALERT: Gateway MAC {baseline} != expected {expected}. Possible ARP spoofing!", args.logfile)
 
     if args.once:
         sys.exit(0)
 
-    while True:
-        time.sleep(args.interval)
-        current = get_gateway_mac(gateway_ip)
-        if not current:
-            log(f"Warning: Could not read current MAC for {gateway_ip}. Network hiccup?", args.logfile)
-            continue
-
-        if expected:
-            if current != expected:
-                log(f"ALERT: Gateway MAC changed to {current}, expected {expected}. Possible MITM!", args.logfile)
-        else:
-            if current != baseline:
-                log(f"ALERT: Gateway MAC changed! was {baseline}, now {current}. Possible ARP spoofing.", args.logfile)
-                # Optional: update baseline only if you know the change is legitimate
-                # baseline = current
+    asyncio.run(watch(baselines, expected, args.interval, args.logfile))
 
 def _cli():
     try:
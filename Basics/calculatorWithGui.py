@@ -1,10 +1,50 @@
+import ast
+import operator
 import tkinter as tk
+from functools import lru_cache
+
+_BIN_OPS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+}
+_UNARY_OPS = {
+    ast.UAdd: operator.pos,
+    ast.USub: operator.neg,
+}
+
+class _SafeEval(ast.NodeVisitor):
+    # Only numbers and + - * / are allowed; anything else is rejected
+    def visit_BinOp(self, node):
+        op = _BIN_OPS.get(type(node.op))
+        if op is None:
+            raise ValueError("unsupported operator")
+        return op(self.visit(node.left), self.visit(node.right))
+
+    def visit_UnaryOp(self, node):
+        op = _UNARY_OPS.get(type(node.op))
+        if op is None:
+            raise ValueError("unsupported operator")
+        return op(self.visit(node.operand))
+
+    def visit_Constant(self, node):
+        if isinstance(node.value, (int, float)) and not isinstance(node.value, bool):
+            return node.value
+        raise ValueError("unsupported constant")
+
+    def generic_visit(self, node):
+        raise ValueError(f"unsupported expression: {type(node).__name__}")
+
+@lru_cache(maxsize=128)
+def evaluate(expr):
+    return _SafeEval().visit(ast.parse(expr, mode="eval").body)
 
 def on_click(button_text):
     current = display_var.get()
     if button_text == "=":
         try:
-            result = str(eval(current))
+            result = str(evaluate(current))
             display_var.set(result)
         except:
             display_var.set("Error")
@@ -1,13 +1,18 @@
+import math
+import sys
 import time
 from datetime import datetime
 
 print(" Digital Clock (Press Ctrl+C to stop)")
 
 try:
+    # Sleep until the next whole second instead of sleep(1) so the display doesn't drift
+    next_tick = math.ceil(time.time())
     while True:
-        now = datetime.now()
-        current_time = now.strftime("%H:%M:%S")
-        print(f"\r{current_time}", end="")
-        time.sleep(1)
+        time.sleep(max(0, next_tick - time.time()))
+        # skip ahead rather than replaying missed ticks (e.g. after a suspend)
+        next_tick = max(next_tick + 1, math.ceil(time.time()))
+        sys.stdout.write(f"\r{datetime.now():%H:%M:%S}")
+        sys.stdout.flush()
 except KeyboardInterrupt:
     print("\n Clock stopped.")
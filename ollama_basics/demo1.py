@@ -1,4 +1,11 @@
-from openpyxl import Workbook
+import numpy as np
+
+try:
+    import xlsxwriter  # optional, faster streaming XLSX writer
+    XLSXWRITER_AVAILABLE = True
+except Exception:
+    from openpyxl import Workbook
+    XLSXWRITER_AVAILABLE = False
 
 def calc_counts(size):
     diff = size - 10
@@ -6,26 +13,55 @@ def calc_counts(size):
     min_c = diff // 2 + (diff % 2)
     return max_c, min_c
 
-wb = Workbook()
-ws1 = wb.active
-ws1.title = "1D_TestCases_Summary"
-ws1.append(["TestCase_ID","Type","Size","Max_Count","Min_Count","Result"])
-
-case_id = 1
-for size in range(10, 101):
-    max_c, min_c = calc_counts(size)
-    result = (max_c + min_c) % size
-    ws1.append([case_id, "1D", size, max_c, min_c, result])
-    case_id += 1
-
-ws2 = wb.create_sheet("2D_TestCases_Summary")
-ws2.append(["TestCase_ID","Type","Size","Max_Count","Min_Count","Result"])
-for m in range(10, 101):
-    for n in range(10, 101):
-        max_c, min_c = calc_counts(m)
-        result = (max_c + min_c) % (m*n)
-        ws2.append([case_id, "2D", f"{m}x{n}", max_c, min_c, result])
+HEADER = ["TestCase_ID","Type","Size","Max_Count","Min_Count","Result"]
+OUTPUT = "Hackathon_TestCases.xlsx"
+
+# calc_counts works element-wise on arrays too, so every size is computed once
+sizes = np.arange(10, 101)
+max_c, min_c = calc_counts(sizes)
+mc_sum = max_c + min_c
+
+def rows_1d(case_id):
+    result_1d = mc_sum % sizes
+    for size, mx, mn, result in zip(sizes.tolist(), max_c.tolist(), min_c.tolist(), result_1d.tolist()):
+        yield (case_id, "1D", size, mx, mn, result)
         case_id += 1
 
-wb.save("Hackathon_TestCases.xlsx")
+def rows_2d(case_id):
+    # 2D cases depend only on m for the counts; broadcast the result over every (m, n)
+    M, N = np.meshgrid(sizes, sizes, indexing="ij")
+    result_2d = mc_sum[:, None] % (M * N)
+    ns = sizes.tolist()
+    # everything that depends only on m is hoisted out of the inner loop
+    for m, mx, mn, results in zip(ns, max_c.tolist(), min_c.tolist(), result_2d.tolist()):
+        prefix = f"{m}x"
+        for n, result in zip(ns, results):
+            yield (case_id, "2D", f"{prefix}{n}", mx, mn, result)
+            case_id += 1
+
+sheets = [
+    ("1D_TestCases_Summary", rows_1d(1)),
+    ("2D_TestCases_Summary", rows_2d(len(sizes) + 1)),
+]
+
+if XLSXWRITER_AVAILABLE:
+    # constant_memory flushes each row to disk as soon as the next one starts
+    wb = xlsxwriter.Workbook(OUTPUT, {"constant_memory": True})
+    for title, rows in sheets:
+        ws = wb.add_worksheet(title)
+        ws.write_row(0, 0, HEADER)
+        for r, row in enumerate(rows, 1):
+            ws.write_row(r, 0, row)
+    wb.close()
+else:
+    # write-only workbook streams rows out instead of keeping every cell in memory;
+    # sheets must be created explicitly (there is no wb.active)
+    wb = Workbook(write_only=True)
+    for title, rows in sheets:
+        ws = wb.create_sheet(title)
+        ws.append(HEADER)
+        for row in rows:
+            ws.append(row)
+    wb.save(OUTPUT)
+
 print("Excel file created successfully.")
@@ -1,33 +1,161 @@
-import PyPDF2
 import re
 import difflib
+import hashlib
+import os
+import pickle
+from functools import lru_cache
+
+try:
+    import pypdfium2 as pdfium  # optional, PDFium (C++) text extraction
+    PDFIUM_AVAILABLE = True
+except Exception:
+    import PyPDF2
+    PDFIUM_AVAILABLE = False
+
+try:
+    from rapidfuzz import process, fuzz  # optional, C++ backed scoring
+    RAPIDFUZZ_AVAILABLE = True
+except Exception:
+    RAPIDFUZZ_AVAILABLE = False
+
+try:
+    import hyperscan  # optional, SIMD multi-pattern matching
+    HYPERSCAN_AVAILABLE = True
+except Exception:
+    HYPERSCAN_AVAILABLE = False
 
 file_path = "sample.pdf"
 
+# parsed pages are cached here, keyed by the SHA-256 of the PDF bytes plus the
+# cache format and text backend; bump CACHE_VERSION whenever the page format
+# or the name heuristics in find_name_candidates change
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "pdf_checker")
+CACHE_VERSION = 1
+
+# precompiled patterns (used on every document)
+# The three name heuristics stay separate passes on purpose: their matches
+# overlap ("Name: John Doe was ..." is both a labeled field and a title-case
+# name), and one alternation would consume the labeled span and lose the
+# title-case/uppercase names inside it.
+_NAME_LABELED = re.compile(r'(?:name|applicant name|applicant|candidate|student)[\s:\-]+([A-Za-z ,.\'-]{2,120})', re.I)
+_TITLE_CASE = re.compile(r'\b([A-Z][a-z]+(?:\s+[A-Z][a-z]+){1,3})\b')
+_UPPER = re.compile(r'\b([A-Z]{2,}(?:\s+[A-Z]{2,}){1,3})\b')
+_NAME_PATTERNS = [_NAME_LABELED, _TITLE_CASE, _UPPER]
+# the title-case and uppercase heuristics as Hyperscan expressions, keyed by their
+# index in _NAME_PATTERNS; Hyperscan only reports match offsets, so captures are
+# left to the re patterns. The labeled pattern always runs through re: its
+# {2,120} repeat is "too large" for Hyperscan with SOM_LEFTMOST, and without
+# SOM its start can't be recovered (the [\s:\-]+ separator is unbounded)
+_HS_EXPRESSIONS = {
+    1: br'\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+){1,3}\b',
+    2: br'\b[A-Z]{2,}(?:\s+[A-Z]{2,}){1,3}\b',
+}
+# the compiled database is only used if it finds the same candidates as re on this
+_HS_SELF_CHECK = ("CERTIFICATE OF MERIT\nName: John Doe was awarded to Jane Mary Smith\n"
+                  "Student Name: Mary Jane Watson Parker, Class 10 ELIGIBLE FOR ADMISSION")
+_hs_db = None
+_NORMALIZE = re.compile(r'[^a-z0-9]+')
+_WORD = re.compile(r"[A-Za-z']+")
+
+def iter_pdf_pages(pdf_path):
+    """Yield the text of each page of a PDF file, one page at a time."""
+    if PDFIUM_AVAILABLE:
+        pdf = pdfium.PdfDocument(pdf_path)
+        try:
+            for page in pdf:
+                textpage = page.get_textpage()
+                try:
+                    yield textpage.get_text_range() or ""
+                finally:
+                    textpage.close()
+                    page.close()
+        finally:
+            pdf.close()
+    else:
+        with open(pdf_path, "rb") as file:
+            reader = PyPDF2.PdfReader(file)
+            for page in reader.pages:
+                yield page.extract_text() or ""
+
 def extract_pdf_text(pdf_path):
     """Extract original text and lowercase text from a PDF file."""
-    original = ""
-    with open(pdf_path, "rb") as file:
-        reader = PyPDF2.PdfReader(file)
-        for page in reader.pages:
-            page_text = page.extract_text() or ""
-            original += page_text + "\n"
+    original = "".join(page_text + "\n" for page_text in iter_pdf_pages(pdf_path))
     return original, original.lower()
 
+def _get_hs_db():
+    global _hs_db, HYPERSCAN_AVAILABLE
+    if _hs_db is None and HYPERSCAN_AVAILABLE:
+        try:
+            db = hyperscan.Database()
+            ids = list(_HS_EXPRESSIONS)
+            db.compile(expressions=[_HS_EXPRESSIONS[i] for i in ids], ids=ids, elements=len(ids),
+                       flags=[hyperscan.HS_FLAG_SOM_LEFTMOST] * len(ids))
+            if _region_name_matches(_HS_SELF_CHECK, db) != _plain_name_matches(_HS_SELF_CHECK):
+                raise RuntimeError("Hyperscan regions disagree with re")
+            _hs_db = db
+        except Exception as e:
+            print(f"Warning: Hyperscan prefilter disabled ({e})")
+            HYPERSCAN_AVAILABLE = False
+    return _hs_db
+
+def _merge_spans(spans):
+    spans.sort()
+    regions = []
+    for start, end in spans:
+        if regions and start <= regions[-1][1]:
+            regions[-1][1] = max(regions[-1][1], end)
+        else:
+            regions.append([start, end])
+    return regions
+
+def _candidate_regions(text, db):
+    """Return {pattern index: merged (start, end) spans of text where it matches}."""
+    spans = {i: [] for i in _HS_EXPRESSIONS}
+
+    def on_match(id, start, end, flags, context=None):
+        spans[id].append((start, end))
+
+    db.scan(text.encode("ascii"), match_event_handler=on_match)
+    return {i: _merge_spans(s) for i, s in spans.items()}
+
+def _plain_name_matches(text):
+    return [[(m.span(), m.group(1)) for m in pattern.finditer(text)] for pattern in _NAME_PATTERNS]
+
+def _region_name_matches(text, db):
+    # every match of a pattern lies inside one merged region of that pattern,
+    # so scanning just those regions gives the same matches as the whole text
+    regions = _candidate_regions(text, db)
+    result = []
+    for i, pattern in enumerate(_NAME_PATTERNS):
+        if i in regions:
+            matches = (m for start, end in regions[i] for m in pattern.finditer(text, start, end))
+        else:
+            matches = pattern.finditer(text)
+        result.append([(m.span(), m.group(1)) for m in matches])
+    return result
+
+def _name_matches(text):
+    """Return the labeled, title-case and uppercase matches as (span, name) lists, each from its own pass."""
+    # byte offsets only line up with str indices for ASCII text
+    if text.isascii() and _get_hs_db():
+        return _region_name_matches(text, _hs_db)
+    return _plain_name_matches(text)
+
 def find_name_candidates(original_text):
     """Find likely name strings from the PDF using multiple heuristics."""
     candidates = []
+    labeled, title, upper = _name_matches(original_text)
 
     # labeled fields: "Name: John Doe", "Applicant Name - John Doe"
-    for match in re.findall(r'(?:name|applicant name|applicant|candidate|student)[\s:\-]+([A-Za-z ,.\'-]{2,120})', original_text, flags=re.I):
+    for _, match in labeled:
         candidates.append(match.strip())
 
     # Title-case sequences (common for printed names)
-    for match in re.findall(r'\b([A-Z][a-z]+(?:\s+[A-Z][a-z]+){1,3})\b', original_text):
+    for _, match in title:
         candidates.append(match.strip())
 
     # UPPERCASE sequences (e.g., CERTIFICATES with full-caps names)
-    for match in re.findall(r'\b([A-Z]{2,}(?:\s+[A-Z]{2,}){1,3})\b', original_text):
+    for _, match in upper:
         # normalize spacing and capitalize for readability
         candidates.append(match.strip().title())
 
@@ -41,15 +169,16 @@ def find_name_candidates(original_text):
             uniq.append(c)
     return uniq
 
+@lru_cache(maxsize=4096)
 def normalize_name(s):
-    return re.sub(r'[^a-z0-9]+', ' ', s.lower()).strip()
+    return _NORMALIZE.sub(' ', s.lower()).strip()
 
 def best_name_match(user_name, candidates):
     """Return best candidate and similarity ratio (0..1) using SequenceMatcher."""
     user_n = normalize_name(user_name)
     best = ("", 0.0)
-    for c in candidates:
-        c_n = normalize_name(c)
+    norm_cands = [(c, normalize_name(c)) for c in candidates]
+    for c, c_n in norm_cands:
         score = difflib.SequenceMatcher(None, user_n, c_n).ratio()
         if score > best[1]:
             best = (c, score)
@@ -57,39 +186,132 @@ def best_name_match(user_name, candidates):
 
 def fuzzy_scan_windows(original_text, user_name, max_words=4):
     """Slide over the text words and try small phrases against user_name for best fuzzy score."""
-    words = re.findall(r"[A-Za-z']+", original_text)
+    # normalize each word once; a window is then just a join of normalized words
+    # (words that normalize to nothing, e.g. a lone apostrophe, are dropped)
+    pairs = [(w, normalize_name(w)) for w in _WORD.findall(original_text)]
+    pairs = [(w, w_n) for w, w_n in pairs if w_n]
+    words = [w for w, _ in pairs]
+    norm_words = [w_n for _, w_n in pairs]
     user_n = normalize_name(user_name)
     best_phrase, best_score = "", 0.0
     n = len(words)
+    if RAPIDFUZZ_AVAILABLE:
+        windows = [(i, wlen) for wlen in range(2, max_words + 1) for i in range(0, n - wlen + 1)]
+        # rapidfuzz's Indel ratio is never below SequenceMatcher.ratio(), so it is an
+        # upper bound: score every window in one batched call, then compute the real
+        # difflib ratio (the metric best_name_match uses) in descending bound order
+        # until no remaining window can beat the best
+        phrases = [" ".join(norm_words[i:i + wlen]) for i, wlen in windows]
+        sm = difflib.SequenceMatcher(None, user_n)
+        best_idx = None
+        for _, bound, idx in process.extract(user_n, phrases, scorer=fuzz.ratio, processor=None, limit=None):
+            if bound / 100.0 < best_score - 1e-9:
+                break
+            sm.set_seq2(phrases[idx])
+            score = sm.ratio()
+            # ties go to the earliest window, as in the plain loop below
+            if score > best_score or (score == best_score and best_idx is not None and idx < best_idx):
+                best_score, best_idx = score, idx
+        if best_idx is not None:
+            i, wlen = windows[best_idx]
+            best_phrase = " ".join(words[i:i + wlen])
+        return best_phrase, best_score
+    sm = difflib.SequenceMatcher(None, user_n)
     for wlen in range(2, max_words + 1):
         for i in range(0, n - wlen + 1):
-            phrase = " ".join(words[i:i + wlen])
-            score = difflib.SequenceMatcher(None, user_n, normalize_name(phrase)).ratio()
+            # the phrase has to be seq2 (ratio() isn't symmetric and the username is
+            # seq1), so set_seq2 still rebuilds the b2j index for every phrase; the
+            # saving is only that real_quick_ratio/quick_ratio, cheap upper bounds on
+            # ratio(), let phrases that can't beat the current best skip ratio()
+            sm.set_seq2(" ".join(norm_words[i:i + wlen]))
+            if sm.real_quick_ratio() <= best_score or sm.quick_ratio() <= best_score:
+                continue
+            score = sm.ratio()
             if score > best_score:
-                best_phrase, best_score = phrase, score
+                best_phrase, best_score = " ".join(words[i:i + wlen]), score
     return best_phrase, best_score
 
+def file_sha256(path):
+    """Return the hex SHA-256 of a file, read in chunks."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+def load_pages(pdf_path):
+    """Return [(page_text, candidates), ...] for a PDF, parsing it only if it isn't cached."""
+    backend = "pdfium" if PDFIUM_AVAILABLE else "pypdf2"
+    key = f"v{CACHE_VERSION}-{backend}-{file_sha256(pdf_path)}"
+    cache_path = os.path.join(CACHE_DIR, key + ".pkl")
+    try:
+        with open(cache_path, "rb") as f:
+            return pickle.load(f)
+    except Exception:
+        pass
+
+    pages = [(page_text, find_name_candidates(page_text)) for page_text in iter_pdf_pages(pdf_path)]
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        # write to a temp file first so a crash never leaves a truncated entry
+        tmp_path = cache_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(pages, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass
+    return pages
+
 def check_document(pdf_path, username, eligibility_keyword="eligible", threshold=0.70):
-    original_text, lower_text = extract_pdf_text(pdf_path)
+    # score page by page; stop early only once the name has been found verbatim
+    # and the eligibility keyword has been seen, since then A and B are both
+    # settled (a fuzzy score alone never is: a later page may hold the exact name)
+    parts = []
+    best_candidate, similarity = "", 0.0
+    user_lower = username.lower()
+    direct_seen = False
+    keyword_seen = not eligibility_keyword
+    for page_text, page_candidates in load_pages(pdf_path):
+        parts.append(page_text + "\n")
+        page_lower = page_text.lower()
 
-    # A: direct substring match (strong) on lowercase text
-    A_direct = username.lower() in lower_text
+        if not direct_seen:
+            direct_seen = user_lower in page_lower
+        # candidates are only needed until the name has been found verbatim
+        if not direct_seen:
+            # score this page's labeled/title/uppercase candidates
+            cand, score = best_name_match(username, page_candidates)
+            if score > similarity:
+                best_candidate, similarity = cand, score
 
-    # find labeled/title/uppercase candidates and compute best similarity
-    candidates = find_name_candidates(original_text)
-    best_candidate, similarity = best_name_match(username, candidates)
+        if not keyword_seen:
+            keyword_seen = eligibility_keyword.lower() in page_lower
+        if direct_seen and keyword_seen:
+            break
 
-    # also try sliding-window fuzzy scan over the document for missed names
-    sw_phrase, sw_score = fuzzy_scan_windows(original_text, username, max_words=4)
-    if sw_score > similarity:
-        best_candidate, similarity = sw_phrase, sw_score
+    original_text = "".join(parts)
+    lower_text = original_text.lower()
 
-    # decide name match using threshold or direct match
-    A = A_direct or (similarity >= threshold)
+    # A: direct substring match (strong) on lowercase text
+    A_direct = user_lower in lower_text
 
     # B: eligibility keyword (check lowercase)
     B = eligibility_keyword.lower() in lower_text if eligibility_keyword else True
 
+    if A_direct:
+        # the exact name is in the document; no fuzzy matching needed
+        best_candidate, similarity = username, 1.0
+    elif similarity < threshold:
+        # also try sliding-window fuzzy scan over the document for missed names;
+        # windows longer than the name plus one word can't score well
+        max_words = min(4, len(username.split()) + 1)
+        sw_phrase, sw_score = fuzzy_scan_windows(original_text, username, max_words=max_words)
+        if sw_score > similarity:
+            best_candidate, similarity = sw_phrase, sw_score
+
+    # decide name match using threshold or direct match
+    A = A_direct or (similarity >= threshold)
+
     # Logical decision: admission allowed if both A and B
     Y = A and B
 